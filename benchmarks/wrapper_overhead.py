@@ -0,0 +1,75 @@
+"""
+Micro-benchmark of the per-call overhead of `CRUDManager` compared with raw
+`Session` calls.
+
+Run it from the repository root, so that the package is importable:
+
+    python -m benchmarks.wrapper_overhead
+"""
+
+import timeit
+
+from sqlmodel import Field, Session, SQLModel, create_engine, select
+
+from sqlmodel_crud_manager.crud import CRUDManager
+from sqlmodel_crud_manager.decorator import raise_as_http_exception
+
+CALLS = 200_000
+QUERIES = 2_000
+
+
+class BenchHero(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    name: str
+
+
+class Plain:
+    def noop(self):
+        return None
+
+
+class Wrapped:
+    @raise_as_http_exception
+    def noop(self):
+        return None
+
+
+def per_call(statement: str, namespace: dict, number: int) -> float:
+    best = min(timeit.repeat(statement, globals=namespace, number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main() -> None:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    crud = CRUDManager(BenchHero, engine)
+    pk = crud.create(BenchHero(name="Deadpond")).id
+    session = Session(engine)
+    namespace = {
+        "crud": crud,
+        "session": session,
+        "select": select,
+        "BenchHero": BenchHero,
+        "pk": pk,
+        "plain": Plain(),
+        "wrapped": Wrapped(),
+    }
+
+    wrapper = per_call("wrapped.noop()", namespace, CALLS) - per_call(
+        "plain.noop()", namespace, CALLS
+    )
+    raw = per_call(
+        "session.exec(select(BenchHero).where(BenchHero.id == pk)).one_or_none()",
+        namespace,
+        QUERIES,
+    )
+    manager = per_call("crud.get(pk)", namespace, QUERIES)
+
+    print(f"wrapper overhead:      {wrapper:8.3f} us/call")
+    print(f"raw Session get:       {raw:8.3f} us/call")
+    print(f"CRUDManager.get:       {manager:8.3f} us/call")
+    print(f"manager overhead:      {manager - raw:8.3f} us/call")
+
+
+if __name__ == "__main__":
+    main()
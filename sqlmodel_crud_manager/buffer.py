@@ -0,0 +1,303 @@
+import atexit
+import contextlib
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import inspect, tuple_
+from sqlmodel import Session, SQLModel, select
+from sqlmodel import update as sqlmodel_update
+
+from sqlmodel_crud_manager.crud import CRUDManager
+from sqlmodel_crud_manager.events import ChangeEvent, publish_events, stage_events
+
+
+@dataclass
+class PendingWrite:
+    """
+    A queued write. `pk` is the tuple of primary key values, or `None` for
+    creates, and `values` are the (coalesced) field values to persist.
+    """
+
+    operation: str
+    pk: tuple | None
+    values: dict[str, Any]
+
+
+ErrorCallback = Callable[[PendingWrite, Exception], None]
+
+
+class BufferedWriter:
+    """
+    A write-behind buffer around a `CRUDManager`. Creates, updates and upserts
+    are queued in memory, repeated writes to the same primary key are merged
+    into one, and a background thread persists the queue in a single
+    transaction whenever `max_batch_size` writes are pending or every
+    `flush_interval` seconds.
+
+    Writes are last-write-wins, so managers with a `version_field` are not
+    supported, and rows are identified by the mapped primary key, so neither
+    are managers with a custom `primary_key`.
+    """
+
+    def __init__(
+        self,
+        crud: CRUDManager,
+        *,
+        max_batch_size: int = 500,
+        flush_interval: float | None = 1.0,
+        max_pending: int = 10_000,
+        on_error: ErrorCallback = None,
+    ):
+        """
+        The function initializes the buffer and starts its flushing thread.
+
+        Arguments:
+
+        * `crud`: The manager whose model and engine the writes go to.
+        * `max_batch_size`: The number of pending writes that wakes up the
+        flushing thread.
+        * `flush_interval`: The maximum number of seconds a write waits in the
+        buffer. With `None` no thread is started and the buffer is only
+        flushed by the size thresholds, `flush()` and `close()`.
+        * `max_pending`: The backpressure limit. When this many writes are
+        pending the calling thread flushes the buffer itself before queueing
+        more.
+        * `on_error`: Called with the `PendingWrite` and the exception for
+        every write that could not be persisted, after the flush finished, so
+        it can queue the writes again. Without it, failed writes are dropped.
+        """
+        if crud.version_field is not None:
+            raise ValueError(
+                "BufferedWriter coalesces writes and cannot honour the "
+                f"optimistic concurrency of {crud.model.__name__}"
+            )
+        mapper = inspect(crud.model)
+        mapper_key = tuple(
+            mapper.get_property_by_column(column).key for column in mapper.primary_key
+        )
+        if crud.primary_key != mapper_key:
+            raise ValueError(
+                "BufferedWriter persists updates by the mapped primary key "
+                f"{mapper_key} of {crud.model.__name__}, not by {crud.primary_key}"
+            )
+        self.crud = crud
+        self.engine = crud.db.get_bind()
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.on_error = on_error
+
+        self._creates: list[PendingWrite] = []
+        self._writes: dict[tuple, PendingWrite] = {}
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._thread = None
+        if flush_interval is not None:
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f"BufferedWriter-{crud.model.__name__}",
+                daemon=True,
+            )
+            self._thread.start()
+        atexit.register(self.close)
+
+    def __enter__(self) -> "BufferedWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        return len(self._creates) + len(self._writes)
+
+    def create(self, object: SQLModel) -> None:
+        """
+        The function queues the creation of `object`. It is validated against
+        the model right away, so invalid objects fail in the caller.
+        """
+        values = self.crud.model.model_validate(object).model_dump(exclude_unset=True)
+        self._enqueue(PendingWrite("create", None, values))
+
+    def update(self, object: SQLModel) -> None:
+        """
+        The function queues an update of the row identified by the primary key
+        of `object`. Queued updates of the same row are merged, the latest
+        value of every field wins.
+        """
+        self._enqueue(self._keyed("update", object))
+
+    def upsert(self, object: SQLModel) -> None:
+        """
+        The function queues a write that updates the row identified by the
+        primary key of `object`, or creates it if it does not exist when the
+        buffer is flushed.
+        """
+        self._enqueue(self._keyed("upsert", object))
+
+    def flush(self) -> None:
+        """
+        The function persists every pending write in a single transaction. If
+        the transaction fails, the writes are retried one by one so that only
+        the failing ones are reported to `on_error`.
+        """
+        failures = []
+        with self._flush_lock:
+            with self._condition:
+                creates, writes = self._creates, list(self._writes.values())
+                self._creates, self._writes = [], {}
+            if not creates and not writes:
+                return
+            try:
+                self._commit(creates, writes)
+            except Exception:
+                for write in creates + writes:
+                    if (error := self._retry(write)) is not None:
+                        failures.append((write, error))
+        # Outside of the lock, so the callback can queue writes again
+        if self.on_error is not None:
+            for write, error in failures:
+                self.on_error(write, error)
+
+    def close(self) -> None:
+        """
+        The function stops the flushing thread and flushes the remaining
+        writes. It is registered with `atexit`, so pending writes are also
+        flushed on interpreter shutdown.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+        atexit.unregister(self.close)
+
+    def _keyed(self, operation: str, object: SQLModel) -> PendingWrite:
+        values = object.model_dump(exclude_unset=True)
+        pk = tuple(values.pop(field, None) for field in self.crud.primary_key)
+        if None in pk:
+            raise ValueError(f"Cannot {operation} an object without primary key")
+        return PendingWrite(operation, pk, values)
+
+    def _enqueue(self, write: PendingWrite) -> None:
+        if self.pending >= self.max_pending:
+            self.flush()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("BufferedWriter is closed")
+            if write.pk is None:
+                self._creates.append(write)
+            elif queued := self._writes.get(write.pk):
+                queued.values.update(write.values)
+                if write.operation == "upsert":
+                    queued.operation = "upsert"
+            else:
+                self._writes[write.pk] = write
+            if self.pending >= self.max_batch_size:
+                self._condition.notify_all()
+        if self._thread is None and self.pending >= self.max_batch_size:
+            self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._closed and self.pending < self.max_batch_size:
+                    self._condition.wait(self.flush_interval)
+                if self._closed:
+                    return
+            # Keep the thread alive if an `on_error` callback raises
+            with contextlib.suppress(Exception):
+                self.flush()
+
+    def _retry(self, write: PendingWrite) -> Exception | None:
+        try:
+            if write.pk is None:
+                self._commit([write], [])
+            else:
+                self._commit([], [write])
+        except Exception as e:
+            return e
+        return None
+
+    def _commit(self, creates: list[PendingWrite], writes: list[PendingWrite]) -> None:
+        sinks = self.crud.event_sinks
+        with Session(self.engine) as session:
+            created, updated = self._persist(session, creates, writes)
+            if not sinks:
+                session.commit()
+                return
+            session.flush()
+            events = self._events(created, updated)
+            stage_events(sinks, session, events)
+            session.commit()
+        publish_events(sinks, events)
+
+    def _events(
+        self,
+        created: list[SQLModel],
+        updated: list[dict[str, Any]],
+    ) -> list[ChangeEvent]:
+        primary_key = self.crud.primary_key
+        name = self.crud.model.__name__
+        events = []
+        if created:
+            keys = [
+                tuple(getattr(obj, field) for field in primary_key) for obj in created
+            ]
+            columns = tuple(c for c in self.crud.columns if c not in primary_key)
+            events.append(ChangeEvent(name, "create", self._unwrap(keys), columns))
+        if updated:
+            keys = [tuple(row[field] for field in primary_key) for row in updated]
+            written = {column for row in updated for column in row}
+            columns = tuple(
+                c for c in self.crud.columns if c in written and c not in primary_key
+            )
+            events.append(ChangeEvent(name, "update", self._unwrap(keys), columns))
+        return events
+
+    def _unwrap(self, keys: list[tuple]) -> tuple:
+        if self.crud.is_composite:
+            return tuple(keys)
+        return tuple(key[0] for key in keys)
+
+    def _existing_keys(self, session: Session, keys: list[tuple]) -> set[tuple]:
+        columns = self.crud.pk_columns
+        if self.crud.is_composite:
+            query = select(*columns).where(tuple_(*columns).in_(keys))
+            return {tuple(row) for row in session.exec(query)}
+        query = select(columns[0]).where(columns[0].in_([key[0] for key in keys]))
+        return {(value,) for value in session.exec(query)}
+
+    def _persist(
+        self,
+        session: Session,
+        creates: list[PendingWrite],
+        writes: list[PendingWrite],
+    ) -> tuple[list[SQLModel], list[dict[str, Any]]]:
+        model = self.crud.model
+        upserts = [write.pk for write in writes if write.operation == "upsert"]
+        existing = self._existing_keys(session, upserts) if upserts else set()
+
+        new_rows = [write.values for write in creates]
+        updates = []
+        for write in writes:
+            row = {
+                **dict(zip(self.crud.primary_key, write.pk, strict=True)),
+                **write.values,
+            }
+            if write.operation == "upsert" and write.pk not in existing:
+                new_rows.append(row)
+            elif write.values:
+                updates.append(row)
+
+        created = [model.model_validate(row) for row in new_rows]
+        session.add_all(created)
+        if updates:
+            session.exec(sqlmodel_update(model), params=updates)
+        return created, updates
@@ -1,17 +1,56 @@
+import dataclasses
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import List, TypeVar
+from datetime import datetime, timezone
+from http import HTTPStatus
+from typing import Any, Dict, List, TypeVar
 
-from fastapi import HTTPException, status
+from sqlalchemy import DateTime, and_, inspect, tuple_
 from sqlalchemy.engine.base import Engine
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import Session, SQLModel, select
 from sqlmodel import update as sqlmodel_update
 from sqlmodel.sql.expression import Select
 
 from sqlmodel_crud_manager.decorator import for_all_methods, raise_as_http_exception
+from sqlmodel_crud_manager.events import (
+    ChangeEvent,
+    EventSink,
+    publish_events,
+    stage_events,
+)
+from sqlmodel_crud_manager.exceptions import (
+    CRUDException,
+    ExceptionTranslator,
+    to_http_exception,
+)
+from sqlmodel_crud_manager.filters import (
+    AggregateSpec,
+    FilterSpec,
+    OrderSpec,
+    build_aggregates,
+    build_filter,
+    build_order_by,
+    get_column,
+)
+from sqlmodel_crud_manager.loading import LoadSpec, build_load_options
 
 ModelType = TypeVar("ModelType", bound=SQLModel)
 ModelCreateType = TypeVar("ModelCreateType", bound=SQLModel)
 QueryLike = TypeVar("QueryLike", bound=Select)
+PrimaryKey = int | str | tuple | dict[str, Any]
+
+
+@dataclass
+class SyncResult:
+    """
+    The rows touched by `CRUDManager.sync_by_fields`, split by what happened
+    to each of them.
+    """
+
+    created: List[SQLModel] = dataclasses.field(default_factory=list)
+    updated: List[SQLModel] = dataclasses.field(default_factory=list)
+    unchanged: List[SQLModel] = dataclasses.field(default_factory=list)
 
 
 @dataclass
@@ -19,7 +58,16 @@ QueryLike = TypeVar("QueryLike", bound=Select)
 class CRUDManager:
     model: ModelType
 
-    def __init__(self, model: ModelType, engine: Engine):
+    def __init__(
+        self,
+        model: ModelType,
+        engine: Engine,
+        version_field: str = None,
+        primary_key: str | list[str] = None,
+        load: LoadSpec = None,
+        exception_translator: ExceptionTranslator = to_http_exception,
+        event_sinks: List[EventSink] = None,
+    ):
         """
         The function initializes an object with a model and a database session.
 
@@ -28,72 +76,335 @@ class CRUDManager:
         * `model`: The model object represents a specific model or entity in the
         application. It could be a database model, a machine learning model, or
         any other type of model
+        * `version_field`: The optional name of an integer or datetime column
+        used for optimistic concurrency. When set, updates only match the row
+        if its version is still the one the caller read, the version is bumped
+        on every write, and a stale write raises a 409 conflict.
+        * `primary_key`: The field, or list of fields, identifying a row. By
+        default it is detected from the model mapper, so only models whose
+        lookups should use a different unique key need to set it.
+        * `load`: The relationships eagerly loaded by default by every read
+        method, in the format accepted by their `load` argument.
+        * `exception_translator`: A function turning the errors raised by the
+        manager, `CRUDException`s or database errors, into the exception the
+        caller should see. It must return already translated exceptions as
+        is. By default they become FastAPI `HTTPException`s, or stay
+        `CRUDException`s when FastAPI is not installed.
+        * `event_sinks`: The destinations of the `ChangeEvent` emitted by every
+        create, update and delete, e.g. a `CallbackSink`, a `QueueSink` or an
+        `OutboxSink`. No events are built when there are none.
         """
+        self.exception_translator = exception_translator
         self.model = model
         self.db = Session(engine)
+        mapper = inspect(model)
+        self.columns = {
+            prop.key: getattr(model, prop.key) for prop in mapper.column_attrs
+        }
+        if primary_key is None:
+            primary_key = [
+                mapper.get_property_by_column(column).key
+                for column in mapper.primary_key
+            ]
+        elif isinstance(primary_key, str):
+            primary_key = [primary_key]
+        for field in primary_key:
+            self.__validate_field_exists(field)
+        self.primary_key = tuple(primary_key)
+        self.pk_columns = tuple(self.columns[field] for field in primary_key)
+        self.is_composite = len(self.primary_key) > 1
+        self.load_options = build_load_options(model, load)
+        self.event_sinks = list(event_sinks or [])
+        self.version_field = version_field
+        if version_field is not None:
+            self.__validate_field_exists(version_field)
+            # Decide on the SQL type, `TypeDecorator`s (like sqlmodel's datetime
+            # type) do not report a useful `python_type`
+            column_type = self.columns[version_field].type
+            column_type = getattr(column_type, "impl", column_type)
+            self.version_is_timestamp = isinstance(column_type, DateTime)
 
     def __validate_field_exists(self, field: str) -> None:
-        if field not in self.model.model_fields:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
+        if field not in self.columns:
+            raise CRUDException(
+                status_code=HTTPStatus.BAD_REQUEST,
                 detail=f"{self.model} does not have a {field} field",
             )
 
+    def __search_field(self, search_field: str | None) -> str:
+        if search_field is not None:
+            self.__validate_field_exists(search_field)
+            return search_field
+        if self.is_composite:
+            raise CRUDException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail=(
+                    f"{self.model.__name__} has a composite primary key "
+                    f"{self.primary_key}, pass a search_field or use "
+                    "create_or_update_by_fields"
+                ),
+            )
+        return self.primary_key[0]
+
     def __raise_not_found(self, detail: str) -> None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
+        raise CRUDException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=detail,
+        )
+
+    def __pk_values(self, pk: PrimaryKey) -> tuple:
+        if isinstance(pk, dict):
+            pk = tuple(pk.get(field) for field in self.primary_key)
+        elif not self.is_composite or not isinstance(pk, tuple | list):
+            pk = (pk,)
+        if len(pk) != len(self.primary_key):
+            raise CRUDException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail=f"{self.model.__name__} primary key is {self.primary_key}",
+            )
+        return tuple(pk)
+
+    def __pk_clause(self, pk: PrimaryKey) -> Any:
+        if not self.is_composite and not isinstance(pk, dict):
+            return self.pk_columns[0] == pk
+        pairs = zip(self.pk_columns, self.__pk_values(pk), strict=True)
+        return and_(*(column == value for column, value in pairs))
+
+    def __pks_clause(self, pks: List[PrimaryKey]) -> Any:
+        if not self.is_composite:
+            return self.pk_columns[0].in_(pks)
+        return tuple_(*self.pk_columns).in_([self.__pk_values(pk) for pk in pks])
+
+    def __pk_of(self, object: SQLModel) -> PrimaryKey:
+        if not self.is_composite:
+            return getattr(object, self.primary_key[0])
+        return tuple(getattr(object, field) for field in self.primary_key)
+
+    def __describe(self, pk: PrimaryKey) -> str:
+        if not self.is_composite:
+            return f"{self.model.__name__} with {self.primary_key[0]} {pk}"
+        return f"{self.model.__name__} with {self.primary_key} {pk}"
+
+    def __exec_read(
+        self,
+        query: QueryLike,
+        load: LoadSpec,
+        options: List[Any],
+    ) -> Any:
+        if load is not None:
+            options = [*build_load_options(self.model, load), *(options or [])]
+        else:
+            options = [*self.load_options, *(options or [])]
+        if not options:
+            return self.db.exec(query)
+        # Joined eager loads of collections repeat the parent rows
+        return self.db.exec(query.options(*options)).unique()
+
+    def __event(
+        self,
+        operation: str,
+        pks: List[PrimaryKey],
+        columns: List[str] = None,
+    ) -> ChangeEvent:
+        if columns is not None:
+            columns = tuple(
+                column
+                for column in self.columns
+                if column in columns and column not in self.primary_key
+            )
+        return ChangeEvent(self.model.__name__, operation, tuple(pks), columns)
+
+    def __commit(self, events: Callable[[], List[ChangeEvent]] = None) -> None:
+        """
+        Commits the session. With event sinks, the session is flushed first so
+        that `events` can read generated primary keys, the events are staged
+        in the transaction and published once it is committed.
+        """
+        if not self.event_sinks or events is None:
+            self.db.commit()
+            return
+        self.db.flush()
+        if not (pending := [event for event in events() if event.primary_keys]):
+            self.db.commit()
+            return
+        stage_events(self.event_sinks, self.db, pending)
+        self.db.commit()
+        publish_events(self.event_sinks, pending)
+
+    def __raise_conflict(self, detail: str | dict) -> None:
+        self.db.rollback()
+        raise CRUDException(
+            status_code=HTTPStatus.CONFLICT,
             detail=detail,
         )
 
-    def get(self, pk: int, db: Session = None) -> ModelType:
+    def __next_version(self, version: Any) -> Any:
+        if self.version_is_timestamp:
+            return datetime.now(timezone.utc)
+        return (version or 0) + 1
+
+    def __execute_update(
+        self,
+        pk: PrimaryKey,
+        values: Dict[str, Any],
+        version: Any = None,
+    ) -> Dict[str, Any] | None:
+        """
+        Issues a single `UPDATE` for the row `pk`. With a version field the
+        statement also matches the expected `version` and bumps it. The written
+        values are returned, or `None` when no row matched.
+        """
+        stmt = sqlmodel_update(self.model).where(self.__pk_clause(pk))
+        if self.version_field is not None:
+            stmt = stmt.where(self.columns[self.version_field] == version)
+            values = {**values, self.version_field: self.__next_version(version)}
+        result = self.db.exec(stmt.values(**values))
+        if result.rowcount == 0:
+            return None
+        return values
+
+    def __set_version(self, object: ModelType, values: Dict[str, Any]) -> None:
+        if self.version_field is not None:
+            set_committed_value(object, self.version_field, values[self.version_field])
+
+    def __update_values(self, input_object: ModelType) -> tuple[Dict[str, Any], Any]:
+        new_values = input_object.model_dump(exclude_unset=True)
+        if self.version_field is None:
+            return new_values, None
+        new_values.pop(self.version_field, None)
+        return new_values, getattr(input_object, self.version_field)
+
+    def __from_existing(
+        self,
+        db_object: ModelType,
+        object: ModelCreateType,
+    ) -> ModelType:
+        new_object = self.model.model_validate(object)
+        for field in self.primary_key:
+            setattr(new_object, field, getattr(db_object, field))
+        if self.version_field is not None:
+            version = getattr(db_object, self.version_field)
+            setattr(new_object, self.version_field, version)
+        return new_object
+
+    def __changed_values(
+        self,
+        db_object: ModelType,
+        object: ModelCreateType,
+    ) -> Dict[str, Any]:
+        new_values = self.model.model_validate(object).model_dump(
+            exclude_unset=True,
+            exclude={*self.primary_key, self.version_field},
+        )
+        return {
+            field: value
+            for field, value in new_values.items()
+            if field in self.columns and getattr(db_object, field) != value
+        }
+
+    def __update_changed(
+        self,
+        db_object: ModelType,
+        object: ModelCreateType,
+    ) -> Dict[str, Any]:
+        """
+        Writes the columns of `object` that differ from `db_object` and returns
+        the written values, including the bumped version. Nothing is written
+        and an empty dictionary is returned when no column changed or the row
+        no longer exists.
+        """
+        if not (changes := self.__changed_values(db_object, object)):
+            return changes
+        version = None
+        if self.version_field is not None:
+            version = getattr(db_object, self.version_field)
+        pk = self.__pk_of(db_object)
+        if (values := self.__execute_update(pk, changes, version)) is None:
+            if self.version_field is None:
+                return {}
+            self.__raise_conflict(
+                f"{self.__describe(pk)} was modified by another transaction"
+            )
+        return values
+
+    def get(
+        self,
+        pk: PrimaryKey,
+        db: Session = None,
+        *,
+        load: LoadSpec = None,
+        options: List[Any] = None,
+    ) -> ModelType:
         """
         The function retrieves a model object from the database based on its
         primary key and raises an exception if the object is not found.
 
         Arguments:
 
-        * `pk`: The parameter `pk` stands for "primary key" and it is of type
-        `int`. It is used to identify a specific object in the database based
-        on its primary key value.
+        * `pk`: The parameter `pk` stands for "primary key". It is used to
+        identify a specific object in the database based on its primary key
+        value. Composite keys are passed as a tuple in the order of
+        `primary_key`, or as a dictionary of field names to values.
+        * `load`: The relationships to load eagerly, overriding the manager
+        default. A dotted relationship path, a list of paths loaded with
+        `selectinload`, or a dictionary of paths to `selectin`, `joined` or
+        `raise`, e.g. `{"items": "selectin", "items.product": "joined"}`.
+        * `options`: Extra SQLAlchemy loader options added to the query.
 
         Returns:
 
         The `get` method is returning an instance of the `ModelType` class.
         """
         self.db = db or self.db
-        query = select(self.model).where(self.model.id == pk)
-        return self.db.exec(query).one_or_none()
+        query = select(self.model).where(self.__pk_clause(pk))
+        return self.__exec_read(query, load, options).one_or_none()
 
-    def get_or_404(self, pk: int, db: Session = None) -> ModelType:
+    def get_or_404(
+        self,
+        pk: PrimaryKey,
+        db: Session = None,
+        *,
+        load: LoadSpec = None,
+        options: List[Any] = None,
+    ) -> ModelType:
         """
         The function retrieves a model object from the database based on its
         primary key and raises an exception if the object is not found.
 
         Arguments:
 
-        * `pk`: The parameter `pk` stands for "primary key" and it is of type
-        `int`. It is used to identify a specific object in the database based
-        on its primary key value.
+        * `pk`: The parameter `pk` stands for "primary key". It is used to
+        identify a specific object in the database based on its primary key
+        value. Composite keys are passed as a tuple in the order of
+        `primary_key`, or as a dictionary of field names to values.
+        * `load` and `options`: The relationship loading, as in `get`.
 
         Returns:
 
         The `get` method is returning an instance of the `ModelType` class.
         """
-        if obj := self.get(pk, db=db):
-            print(obj)
+        if obj := self.get(pk, db=db, load=load, options=options):
             return obj
-        self.__raise_not_found(f"{self.model.__name__} with id {pk} not found")
+        self.__raise_not_found(f"{self.__describe(pk)} not found")
 
-    def get_by_ids(self, ids: list[int], db: Session = None) -> list[ModelType]:
+    def get_by_ids(
+        self,
+        ids: list[PrimaryKey],
+        db: Session = None,
+        *,
+        load: LoadSpec = None,
+        options: List[Any] = None,
+    ) -> list[ModelType]:
         """
         The function retrieves a list of model objects from the database based
         on their primary keys.
 
         Arguments:
 
-        * `ids`: The parameter `ids` is a list of integers. It is used to
+        * `ids`: The parameter `ids` is a list of primary keys. It is used to
         identify a list of objects in the database based on their primary key
-        values.
+        values. Composite keys are matched with a single tuple `IN` clause.
+        * `load` and `options`: The relationship loading, as in `get`.
 
         Returns:
 
@@ -101,8 +412,8 @@ class CRUDManager:
         `ModelType`.
         """
         self.db = db or self.db
-        query = select(self.model).where(self.model.id.in_(ids))
-        return self.db.exec(query).all()
+        query = select(self.model).where(self.__pks_clause(ids))
+        return self.__exec_read(query, load, options).all()
 
     def get_by_field(
         self,
@@ -110,6 +421,9 @@ class CRUDManager:
         value: str,
         allows_multiple: bool = False,
         db: Session = None,
+        *,
+        load: LoadSpec = None,
+        options: List[Any] = None,
     ) -> ModelType:
         """
         The function retrieves a model object from the database based on a
@@ -123,6 +437,8 @@ class CRUDManager:
         * `value`: The parameter `value` is a string that represents the value
         of a field in the database table.
 
+        * `load` and `options`: The relationship loading, as in `get`.
+
         Returns:
 
         The `get_by_field` method is returning an object of type `ModelType`.
@@ -131,9 +447,10 @@ class CRUDManager:
         self.__validate_field_exists(field)
 
         query = select(self.model).where(getattr(self.model, field) == value)
+        result = self.__exec_read(query, load, options)
         if allows_multiple:
-            return self.db.exec(query).all()
-        return self.db.exec(query).one_or_none()
+            return result.all()
+        return result.one_or_none()
 
     def get_by_field_or_404(
         self,
@@ -141,6 +458,9 @@ class CRUDManager:
         value: str,
         allows_multiple: bool = False,
         db: Session = None,
+        *,
+        load: LoadSpec = None,
+        options: List[Any] = None,
     ) -> ModelType:
         """
         The function retrieves a model object from the database based on a
@@ -154,11 +474,20 @@ class CRUDManager:
         * `value`: The parameter `value` is a string that represents the value
         of a field in the database table.
 
+        * `load` and `options`: The relationship loading, as in `get`.
+
         Returns:
 
         The `get_by_field` method is returning an object of type `ModelType`.
         """
-        if obj := self.get_by_field(field, value, allows_multiple, db=db):
+        if obj := self.get_by_field(
+            field,
+            value,
+            allows_multiple,
+            db=db,
+            load=load,
+            options=options,
+        ):
             return obj
         self.__raise_not_found(
             f"{self.model.__name__} with {field} {value} not found",
@@ -170,6 +499,8 @@ class CRUDManager:
         *,
         allows_multiple: bool = False,
         db: Session = None,
+        load: LoadSpec = None,
+        options: List[Any] = None,
     ) -> list[ModelType] | ModelType:
         """
         The function retrieves a list of model objects from the database based
@@ -180,6 +511,7 @@ class CRUDManager:
         * `fields`: The parameter `fields` is a dictionary of strings that
         represents the name of a field in the database table and the value of
         that field.
+        * `load` and `options`: The relationship loading, as in `get`.
 
         Returns:
 
@@ -191,14 +523,15 @@ class CRUDManager:
         for field, value in fields.items():
             self.__validate_field_exists(field)
             query = query.where(getattr(self.model, field) == value)
+        result = self.__exec_read(query, load, options)
         if allows_multiple:
-            return self.db.exec(query).all()
-        return self.db.exec(query).one_or_none()
+            return result.all()
+        return result.one_or_none()
 
     def get_or_create(
         self,
         object: ModelCreateType,
-        search_field: str = "id",
+        search_field: str = None,
         db: Session = None,
     ) -> ModelType:
         """
@@ -213,8 +546,9 @@ class CRUDManager:
         type of the object that you want to create.
         * `search_field`: The `search_field` parameter is a string that specifies the
         field to search for when checking if an object already exists in the database.
-        By default, it is set to "id", meaning it will search for an object with the
-        same id as the one being passed in.
+        By default, it is the primary key of the model, meaning it will search for an
+        object with the same primary key as the one being passed in. Models with a
+        composite primary key need an explicit `search_field`.
         * `db`: The `db` parameter is an optional parameter of type `Session`.
         It represents the database session that will be used for the database operations
         If no session is provided, it will use the default session.
@@ -224,7 +558,7 @@ class CRUDManager:
         The function `get_or_create` returns an instance of `ModelType`.
         """
         self.db = db or self.db
-        self.__validate_field_exists(search_field)
+        search_field = self.__search_field(search_field)
 
         if obj := self.get_by_field(
             search_field,
@@ -235,7 +569,14 @@ class CRUDManager:
         else:
             return self.create(object, db=db)
 
-    def list(self, query: QueryLike = None, db: Session = None) -> list[ModelType]:
+    def list(
+        self,
+        query: QueryLike = None,
+        db: Session = None,
+        *,
+        load: LoadSpec = None,
+        options: List[Any] = None,
+    ) -> list[ModelType]:
         """
         The function returns a list of all the records in the database that
         match the given query.
@@ -246,6 +587,8 @@ class CRUDManager:
         `QueryLike`. It represents a query that will be executed on the
         database. If no query is provided, the function will use a default
         query that selects all records from the `ModelType` table.
+        * `load` and `options`: The relationship loading, as in `get`. They
+        are also applied to a custom `query`.
 
         Returns:
 
@@ -253,7 +596,103 @@ class CRUDManager:
         """
         self.db = db or self.db
         query = query or select(self.model)
-        return self.db.exec(query).all()
+        return self.__exec_read(query, load, options).all()
+
+    def filter(
+        self,
+        filters: FilterSpec = None,
+        *,
+        order_by: OrderSpec = None,
+        limit: int = None,
+        offset: int = None,
+        db: Session = None,
+        load: LoadSpec = None,
+        options: List[Any] = None,
+    ) -> List[ModelType]:
+        """
+        The function returns the records matching a declarative filter
+        specification, compiled into a single `SELECT` statement.
+
+        Arguments:
+
+        * `filters`: A dictionary of field names to values or to
+        `{operator: value}` pairs. Supported operators are `eq`, `ne`, `gt`,
+        `ge`, `lt`, `le`, `in`, `not_in`, `between`, `like`, `ilike` and
+        `is_null`. The `and` / `or` keys take a list of nested filters, e.g.
+        `{"age": {"gt": 18}, "or": [{"name": "A"}, {"is_alive": False}]}`.
+        * `order_by`: A field name or list of field names, prefixed with `-`
+        to sort in descending order.
+        * `limit`: The maximum number of records to return.
+        * `offset`: The number of records to skip.
+        * `db`: The `db` parameter is an optional parameter of type `Session`.
+        * `load` and `options`: The relationship loading, as in `get`.
+
+        Returns:
+
+        A list of objects of type `ModelType`.
+        """
+        self.db = db or self.db
+        name = self.model.__name__
+        query = select(self.model)
+        if filters:
+            query = query.where(build_filter(self.columns, filters, name))
+        if order_by:
+            query = query.order_by(*build_order_by(self.columns, order_by, name))
+        if limit is not None:
+            query = query.limit(limit)
+        if offset is not None:
+            query = query.offset(offset)
+        return self.__exec_read(query, load, options).all()
+
+    def aggregate(
+        self,
+        aggregates: AggregateSpec,
+        *,
+        filters: FilterSpec = None,
+        group_by: List[str] = None,
+        order_by: OrderSpec = None,
+        limit: int = None,
+        db: Session = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        The function computes aggregates over the records matching the
+        filters in the database, optionally grouped by some fields.
+
+        Arguments:
+
+        * `aggregates`: A dictionary of `{label: function}` or
+        `{label: (function, field)}` pairs where the function is one of
+        `count`, `sum`, `avg`, `min` or `max`, e.g.
+        `{"total": "count", "mean_age": ("avg", "age")}`.
+        * `filters`: The same filter specification accepted by `filter`.
+        * `group_by`: A list of field names to group the records by.
+        * `order_by`: Field names or aggregate labels, prefixed with `-` to
+        sort in descending order.
+        * `limit`: The maximum number of rows to return.
+        * `db`: The `db` parameter is an optional parameter of type `Session`.
+
+        Returns:
+
+        A list of dictionaries with one key per group field and aggregate
+        label.
+        """
+        self.db = db or self.db
+        name = self.model.__name__
+        groups = [get_column(self.columns, field, name) for field in group_by or []]
+        expressions = build_aggregates(self.columns, aggregates, name)
+
+        query = select(*groups, *expressions).select_from(self.model)
+        if filters:
+            query = query.where(build_filter(self.columns, filters, name))
+        if groups:
+            query = query.group_by(*groups)
+        if order_by:
+            sortable = {**self.columns, **{e.name: e for e in expressions}}
+            query = query.order_by(*build_order_by(sortable, order_by, name))
+        if limit is not None:
+            query = query.limit(limit)
+        rows = self.db.connection().execute(query).mappings().all()
+        return [dict(row) for row in rows]
 
     def create(self, object: ModelCreateType, db: Session = None) -> ModelType:
         """
@@ -271,7 +710,9 @@ class CRUDManager:
         self.db = db or self.db
         obj = self.model.model_validate(object)
         self.db.add(obj)
-        self.db.commit()
+        self.__commit(
+            lambda: [self.__event("create", [self.__pk_of(obj)], self.columns)]
+        )
         self.db.refresh(obj)
         return obj
 
@@ -297,15 +738,23 @@ class CRUDManager:
         self.db = db or self.db
         objs = [self.model.model_validate(obj) for obj in objects]
         self.db.add_all(objs)
-        self.db.commit()
+        self.__commit(
+            lambda: [
+                self.__event(
+                    "create", [self.__pk_of(obj) for obj in objs], self.columns
+                )
+            ]
+        )
 
         return objs
 
     def create_or_update(
         self,
         object: ModelCreateType,
-        search_field: str = "id",
+        search_field: str = None,
         db: Session = None,
+        *,
+        only_changed: bool = False,
     ) -> ModelType:
         """
         The function `create_or_update` checks if an object exists in the database based
@@ -319,27 +768,34 @@ class CRUDManager:
         type of the object that you want to create.
         * `search_field`: The `search_field` parameter is a string that specifies the
         field to search for when checking if an object already exists in the database.
-        By default, it is set to "id", meaning it will search for an object with the
-        same id as the one being passed in.
+        By default, it is the primary key of the model, meaning it will search for an
+        object with the same primary key as the one being passed in. Models with a
+        composite primary key need an explicit `search_field`.
         * `db`: The `db` parameter is an optional parameter of type `Session`.
         It represents the database session that will be used for the database operations
         If no session is provided, it will use the default session.
+        * `only_changed`: When `True`, the existing row is compared with the
+        incoming values and only the changed columns are written. No statement
+        is issued at all when nothing changed.
 
         Returns:
 
         The function `create_or_update` returns an instance of `ModelType`.
         """
         self.db = db or self.db
-        self.__validate_field_exists(search_field)
+        search_field = self.__search_field(search_field)
 
         if obj := self.get_by_field(
             search_field,
             getattr(object, search_field),
             db=db,
         ):
-            new_object = self.model.model_validate(object)
-            new_object.id = obj.id
-
+            if only_changed:
+                if changes := self.__update_changed(obj, object):
+                    pk = self.__pk_of(obj)
+                    self.__commit(lambda: [self.__event("update", [pk], changes)])
+                return obj
+            new_object = self.__from_existing(obj, object)
             self.update(new_object, db=db)
             return new_object
         else:
@@ -350,6 +806,8 @@ class CRUDManager:
         object: ModelCreateType,
         fields: List[str],
         db: Session = None,
+        *,
+        only_changed: bool = False,
     ) -> ModelType:
         """
         The function `create_or_update_by_fields` creates or updates a model object
@@ -368,6 +826,8 @@ class CRUDManager:
         represents the database session that will be used for database operations.
         If no session is provided, the method will use the default session stored in
         the `self.db` attribute.
+        * `only_changed`: When `True`, only the columns that differ from the
+        existing row are written, and nothing is written if none do.
 
         Returns:
 
@@ -381,8 +841,12 @@ class CRUDManager:
             {field: getattr(object, field) for field in fields},
             db=db,
         ):
-            new_object = self.model.model_validate(object)
-            new_object.id = obj.id
+            if only_changed:
+                if changes := self.__update_changed(obj, object):
+                    pk = self.__pk_of(obj)
+                    self.__commit(lambda: [self.__event("update", [pk], changes)])
+                return obj
+            new_object = self.__from_existing(obj, object)
             self.update(new_object, db=db)
             return new_object
         else:
@@ -393,6 +857,8 @@ class CRUDManager:
         objects: List[ModelCreateType],
         fields: List[str],
         db: Session = None,
+        *,
+        only_changed: bool = False,
     ) -> List[ModelType]:
         """
         The function `create_or_update_multiple_by_fields` creates or updates a list of
@@ -411,12 +877,18 @@ class CRUDManager:
         represents the database session that will be used for database operations.
         If no session is provided, the method will use the default session stored in
         the `self.db` attribute.
+        * `only_changed`: When `True`, the objects are written through
+        `sync_by_fields`, so unchanged rows are not updated at all.
 
         Returns:
 
         The function `create_or_update_multiple_by_fields` returns a list of
         `ModelType` objects.
         """
+        if only_changed:
+            result = self.sync_by_fields(objects, fields, db=db)
+            return result.created + result.updated + result.unchanged
+
         self.db = db or self.db
         for field in fields:
             self.__validate_field_exists(field)
@@ -428,9 +900,7 @@ class CRUDManager:
                 {field: getattr(object, field) for field in fields},
                 db=db,
             ):
-                new_object = self.model.model_validate(object)
-                new_object.id = obj.id
-                objects_to_update.append(new_object)
+                objects_to_update.append(self.__from_existing(obj, object))
             else:
                 objects_to_create.append(object)
 
@@ -439,6 +909,62 @@ class CRUDManager:
 
         return objects_created + objects_updated
 
+    def sync_by_fields(
+        self,
+        objects: List[ModelCreateType],
+        fields: List[str],
+        db: Session = None,
+    ) -> SyncResult:
+        """
+        The function `sync_by_fields` creates the objects that do not exist yet
+        and updates only the changed columns of the ones that do, skipping the
+        rows where nothing changed.
+
+        Arguments:
+
+        * `objects`: The objects that you want to synchronize with the database.
+        * `fields`: The fields used to find the existing record of each object.
+        * `db`: The `db` parameter is an optional argument of type `Session`.
+
+        Returns:
+
+        A `SyncResult` with the `created`, `updated` and `unchanged` rows.
+        """
+        self.db = db or self.db
+        for field in fields:
+            self.__validate_field_exists(field)
+
+        result = SyncResult()
+        objects_to_create = []
+        updated = []
+        for object in objects:
+            if obj := self.get_by_fields(
+                {field: getattr(object, field) for field in fields},
+                db=db,
+            ):
+                if changes := self.__update_changed(obj, object):
+                    result.updated.append(obj)
+                    updated.append((self.__pk_of(obj), changes))
+                else:
+                    result.unchanged.append(obj)
+            else:
+                objects_to_create.append(self.model.model_validate(object))
+
+        if objects_to_create or result.updated:
+            self.db.add_all(objects_to_create)
+            self.__commit(
+                lambda: [
+                    self.__event(
+                        "create",
+                        [self.__pk_of(obj) for obj in objects_to_create],
+                        self.columns,
+                    ),
+                    *(self.__event("update", [pk], values) for pk, values in updated),
+                ]
+            )
+        result.created = objects_to_create
+        return result
+
     def update(self, input_object: ModelType, db: Session = None) -> None:
         """
         The function updates a database object with the values from an input
@@ -454,16 +980,24 @@ class CRUDManager:
 
         The `update` method is returning the `db_object` after it has been
         updated in the database.
+
+        Raises a 409 conflict when the manager has a `version_field`
+        and the row was modified since `input_object` was read.
         """
         self.db = db or self.db
-        new_values = input_object.model_dump(exclude_unset=True)
-        stmt = (
-            sqlmodel_update(self.model)
-            .where(self.model.id == input_object.id)
-            .values(**new_values)
-        )
-        self.db.exec(stmt)
-        self.db.commit()
+        new_values, version = self.__update_values(input_object)
+        pk = self.__pk_of(input_object)
+        values = self.__execute_update(pk, new_values, version)
+        if values is None:
+            if self.version_field is None:
+                # No row matched, there is nothing to report
+                self.__commit()
+                return
+            self.__raise_conflict(
+                f"{self.__describe(pk)} was modified by another transaction"
+            )
+        self.__commit(lambda: [self.__event("update", [pk], values)])
+        self.__set_version(input_object, values)
 
     def update_multiple(
         self,
@@ -484,22 +1018,39 @@ class CRUDManager:
 
         The `update_multiple` method is returning a list of `db_objects` after
         they have been updated in the database.
+
+        With a `version_field`, the batch is applied atomically: if any row
+        was modified since it was read, nothing is written and a 409 conflict
+        is raised whose detail lists the conflicting ids.
         """
 
         self.db = db or self.db
         ids = []
+        updated = []
+        conflicts = []
         for input_object in input_objects:
-            self.db.exec(
-                sqlmodel_update(self.model)
-                .where(self.model.id == input_object.id)
-                .values(**input_object.model_dump(exclude_unset=True))
+            new_values, version = self.__update_values(input_object)
+            pk = self.__pk_of(input_object)
+            if (values := self.__execute_update(pk, new_values, version)) is not None:
+                updated.append((pk, values))
+            elif self.version_field is not None:
+                conflicts.append(pk)
+            ids.append(pk)
+
+        if conflicts:
+            self.__raise_conflict(
+                {
+                    "message": f"{self.model.__name__} rows were modified by "
+                    "another transaction",
+                    "conflicts": conflicts,
+                }
             )
-            ids.append(input_object.id)
-
-        self.db.commit()
+        self.__commit(
+            lambda: [self.__event("update", [pk], values) for pk, values in updated]
+        )
         return self.get_by_ids(ids)
 
-    def delete(self, pk: int, db: Session = None) -> ModelType:
+    def delete(self, pk: PrimaryKey, db: Session = None) -> ModelType:
         """
         The function deletes a database object with a given primary key and
         returns the deleted object.
@@ -507,9 +1058,9 @@ class CRUDManager:
         Arguments:
 
         * `pk`: The "pk" parameter stands for "primary key" and it is used to
-        identify a specific object in the database. In this context, it is an
-        integer value that represents the primary key of the object that needs
-        to be deleted.
+        identify a specific object in the database. In this context, it is the
+        value, or tuple of values for composite keys, of the primary key of the
+        object that needs to be deleted.
 
         Returns:
 
@@ -519,5 +1070,34 @@ class CRUDManager:
         self.db = db or self.db
         db_object = self.get_or_404(pk)
         self.db.delete(db_object)
-        self.db.commit()
+        self.__commit(lambda: [self.__event("delete", [self.__pk_of(db_object)])])
         return db_object
+
+    def delete_multiple(
+        self,
+        ids: List[PrimaryKey],
+        db: Session = None,
+    ) -> List[ModelType]:
+        """
+        The function deletes the database objects with the given primary keys
+        and returns the deleted objects.
+
+        Arguments:
+
+        * `ids`: A list of primary keys, or tuples of values for composite
+        keys, of the objects that need to be deleted. They are loaded with a
+        single `IN` query and deleted in the same transaction.
+
+        Returns:
+
+        The `delete_multiple` method is returning the list of `db_objects` that
+        were deleted from the database.
+        """
+        self.db = db or self.db
+        db_objects = self.get_by_ids(ids)
+        for db_object in db_objects:
+            self.db.delete(db_object)
+        self.__commit(
+            lambda: [self.__event("delete", [self.__pk_of(obj) for obj in db_objects])]
+        )
+        return db_objects
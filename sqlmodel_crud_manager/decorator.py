@@ -1,35 +1,53 @@
-from fastapi import HTTPException
+from functools import wraps
+
+from sqlmodel_crud_manager.exceptions import CRUDException, to_http_exception
 
 
 def raise_as_http_exception(func):
-    def wrapper(*args, **kwargs):
+    """
+    The decorator translates the errors raised by a manager method with the
+    manager's `exception_translator` (FastAPI `HTTPException`s by default).
+    Already translated errors are re-raised untouched, so nested calls are
+    only translated once. The `try` block is free when nothing is raised.
+    """
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
         try:
-            return func(*args, **kwargs)
+            return func(self, *args, **kwargs)
         except Exception as e:
-            if e.__class__.__name__ == "HTTPException":
-                raise e
-
-            else:
-                raise HTTPException(status_code=500, detail=str(e)) from e
+            translator = getattr(self, "exception_translator", to_http_exception)
+            translated = translator(e)
+            if translated is e:
+                raise
+            raise translated from e
 
     return wrapper
 
 
 def raise_404_if_none(func, detail="Not Found"):
+    @wraps(func)
     def wrapper(*args, **kwargs):
         result = func(*args, **kwargs)
         if result is None:
-            raise HTTPException(status_code=404, detail=detail)
+            raise to_http_exception(CRUDException(status_code=404, detail=detail))
         return result
 
     return wrapper
 
 
 def for_all_methods(decorator):
+    """
+    The class decorator applies `decorator` to every public method and to
+    `__init__`. Private helpers are left alone, they only run inside
+    decorated methods and would otherwise pay for the wrapper on every call.
+    """
+
     def decorate(cls):
-        for attr in cls.__dict__:  # there's propably a better way to do this
-            if callable(getattr(cls, attr)):
-                setattr(cls, attr, decorator(getattr(cls, attr)))
+        for attr, value in list(vars(cls).items()):
+            if not callable(value) or (attr.startswith("_") and attr != "__init__"):
+                continue
+            setattr(cls, attr, decorator(value))
         return cls
 
     return decorate
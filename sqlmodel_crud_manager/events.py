@@ -0,0 +1,139 @@
+import json
+import logging
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlmodel import Field, Session, SQLModel
+
+logger = logging.getLogger(__name__)
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """
+    A committed change. `primary_keys` lists the primary key of every affected
+    row (a tuple for composite keys) and `changed_columns` the columns that
+    were written, or `None` for deletes.
+    """
+
+    model: str
+    operation: str
+    primary_keys: tuple
+    changed_columns: tuple[str, ...] | None = None
+    occurred_at: datetime = field(default_factory=utcnow)
+
+
+class EventSink:
+    """
+    The base class of the event destinations. `stage` runs inside the
+    transaction, right before the commit, and `publish` runs after the commit
+    succeeded.
+    """
+
+    def stage(self, session: Session, events: Sequence[ChangeEvent]) -> None:
+        pass
+
+    def publish(self, events: Sequence[ChangeEvent]) -> None:
+        pass
+
+
+class CallbackSink(EventSink):
+    """
+    Calls `callback` with every committed event, in the same process.
+    """
+
+    def __init__(self, callback: Callable[[ChangeEvent], Any]):
+        self.callback = callback
+
+    def publish(self, events: Sequence[ChangeEvent]) -> None:
+        for event in events:
+            self.callback(event)
+
+
+class QueueSink(EventSink):
+    """
+    Puts every committed event in a queue, typically a `multiprocessing.Queue`
+    shared with other worker processes.
+    """
+
+    def __init__(self, queue: Any):
+        self.queue = queue
+
+    def publish(self, events: Sequence[ChangeEvent]) -> None:
+        for event in events:
+            self.queue.put(event)
+
+
+class OutboxRecord(SQLModel):
+    """
+    The columns of an outbox table. Subclass it with `table=True` and a
+    primary key to create the table the `OutboxSink` writes to.
+    """
+
+    model: str = Field(index=True)
+    operation: str
+    primary_keys: str
+    changed_columns: str | None = None
+    occurred_at: datetime = Field(default_factory=utcnow, index=True)
+
+
+class OutboxSink(EventSink):
+    """
+    Writes the events to an outbox table in the same transaction as the
+    change itself, so they are stored if and only if the change is committed.
+    Other processes can then read the table to get every change reliably.
+    Keys and columns are stored as JSON.
+    """
+
+    def __init__(self, outbox_model: type[OutboxRecord]):
+        self.outbox_model = outbox_model
+
+    def stage(self, session: Session, events: Sequence[ChangeEvent]) -> None:
+        session.add_all(
+            [
+                self.outbox_model(
+                    model=event.model,
+                    operation=event.operation,
+                    primary_keys=json.dumps(event.primary_keys, default=str),
+                    changed_columns=(
+                        None
+                        if event.changed_columns is None
+                        else json.dumps(event.changed_columns)
+                    ),
+                    occurred_at=event.occurred_at,
+                )
+                for event in events
+            ]
+        )
+
+
+def stage_events(
+    sinks: Sequence[EventSink],
+    session: Session,
+    events: Sequence[ChangeEvent],
+) -> None:
+    """
+    The function hands the events to every sink before the commit. Errors
+    propagate, so a failing outbox write rolls the change back.
+    """
+    for sink in sinks:
+        sink.stage(session, events)
+
+
+def publish_events(sinks: Sequence[EventSink], events: Sequence[ChangeEvent]) -> None:
+    """
+    The function hands the committed events to every sink. The change is
+    already committed at this point, so sink errors are logged instead of
+    being raised to the caller.
+    """
+    for sink in sinks:
+        try:
+            sink.publish(events)
+        except Exception:
+            logger.exception("Could not publish change events to %r", sink)
@@ -0,0 +1,60 @@
+from collections.abc import Callable
+from functools import cache
+from typing import Any
+
+ExceptionTranslator = Callable[[Exception], Exception]
+
+
+class CRUDException(Exception):
+    """
+    The error raised by the manager itself, carrying the HTTP status code that
+    describes it. It does not depend on any web framework, the manager's
+    exception translator turns it into the exception the application expects.
+    """
+
+    def __init__(self, status_code: int, detail: Any = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.status_code}, {self.detail!r})"
+
+
+def to_crud_exception(exc: Exception) -> Exception:
+    """
+    The translator used when FastAPI is not installed. Unexpected errors are
+    wrapped in a 500 `CRUDException`.
+    """
+    if isinstance(exc, CRUDException):
+        return exc
+    return CRUDException(500, str(exc))
+
+
+@cache
+def http_exception_class() -> type[Exception] | None:
+    """
+    The function imports FastAPI's `HTTPException` the first time an error has
+    to be translated, so importing the manager does not import FastAPI.
+    """
+    try:
+        from fastapi import HTTPException
+    except ImportError:
+        return None
+    return HTTPException
+
+
+def to_http_exception(exc: Exception) -> Exception:
+    """
+    The default translator. `CRUDException`s keep their status code and
+    detail, any other error becomes a 500 FastAPI `HTTPException`, and
+    `HTTPException`s are passed through. Without FastAPI installed it behaves
+    like `to_crud_exception`.
+    """
+    if (http_exception := http_exception_class()) is None:
+        return to_crud_exception(exc)
+    if isinstance(exc, http_exception):
+        return exc
+    if isinstance(exc, CRUDException):
+        return http_exception(status_code=exc.status_code, detail=exc.detail)
+    return http_exception(status_code=500, detail=str(exc))
@@ -0,0 +1,169 @@
+from collections.abc import Callable
+from http import HTTPStatus
+from typing import Any
+
+from sqlalchemy import and_, func, or_
+
+from sqlmodel_crud_manager.exceptions import CRUDException
+
+FilterSpec = dict[str, Any]
+OrderSpec = str | list[str]
+AggregateSpec = dict[str, str | tuple[str, str]]
+
+OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "gt": lambda column, value: column > value,
+    "ge": lambda column, value: column >= value,
+    "lt": lambda column, value: column < value,
+    "le": lambda column, value: column <= value,
+    "in": lambda column, value: column.in_(value),
+    "not_in": lambda column, value: column.not_in(value),
+    "between": lambda column, value: column.between(*value),
+    "like": lambda column, value: column.like(value),
+    "ilike": lambda column, value: column.ilike(value),
+    "is_null": lambda column, value: column.is_(None) if value else column.is_not(None),
+}
+
+AGGREGATES: dict[str, Callable[[Any], Any]] = {
+    "count": func.count,
+    "sum": func.sum,
+    "avg": func.avg,
+    "min": func.min,
+    "max": func.max,
+}
+
+GROUPS = {"and": and_, "or": or_}
+
+
+def raise_bad_request(detail: str) -> None:
+    raise CRUDException(status_code=HTTPStatus.BAD_REQUEST, detail=detail)
+
+
+def get_column(columns: dict[str, Any], field: str, model_name: str) -> Any:
+    """
+    The function returns the column attribute for `field`, raising a 400 error
+    if the model does not have such a column.
+    """
+    if (column := columns.get(field)) is None:
+        raise_bad_request(f"{model_name} does not have a {field} field")
+    return column
+
+
+def validate_operand(operator: str, operand: Any) -> None:
+    """
+    The function raises a 400 error if `operand` does not have the shape
+    `operator` expects.
+    """
+    if operator in ("in", "not_in") and not isinstance(operand, list | tuple):
+        raise_bad_request(f"'{operator}' expects a list of values")
+    if operator == "between" and (
+        not isinstance(operand, list | tuple) or len(operand) != 2
+    ):
+        raise_bad_request("'between' expects a list of two values")
+
+
+def build_filter(columns: dict[str, Any], spec: FilterSpec, model_name: str) -> Any:
+    """
+    The function compiles a declarative filter specification into a single
+    SQLAlchemy boolean clause.
+
+    Arguments:
+
+    * `columns`: A mapping of field names to the model column attributes.
+    * `spec`: A dictionary where every key is either a field name or one of
+    the `and` / `or` group keys. A field maps to a plain value (equality) or
+    to a dictionary of `{operator: value}` pairs, e.g.
+    `{"age": {"gt": 18}, "or": [{"name": "A"}, {"name": {"like": "B%"}}]}`.
+    * `model_name`: The model name used in the error messages.
+
+    Returns:
+
+    A clause that can be passed to `Select.where`.
+    """
+    clauses = []
+    for key, value in spec.items():
+        if key in GROUPS:
+            if not isinstance(value, list) or not value:
+                raise_bad_request(f"'{key}' expects a non-empty list of filters")
+            if not all(isinstance(sub, dict) and sub for sub in value):
+                raise_bad_request(f"'{key}' expects non-empty filter dictionaries")
+            clauses.append(
+                GROUPS[key](*(build_filter(columns, sub, model_name) for sub in value))
+            )
+            continue
+
+        column = get_column(columns, key, model_name)
+        if not isinstance(value, dict):
+            clauses.append(column == value)
+            continue
+        if not value:
+            raise_bad_request(f"Filter on '{key}' does not have any operator")
+        for operator, operand in value.items():
+            if operator not in OPERATORS:
+                raise_bad_request(f"Unsupported filter operator '{operator}'")
+            validate_operand(operator, operand)
+            clauses.append(OPERATORS[operator](column, operand))
+    return and_(*clauses)
+
+
+def build_order_by(
+    columns: dict[str, Any],
+    order_by: OrderSpec,
+    model_name: str,
+) -> list[Any]:
+    """
+    The function compiles a list of field names into `ORDER BY` clauses. A
+    leading `-` sorts the field in descending order, e.g. `["-age", "name"]`.
+    """
+    if isinstance(order_by, str):
+        order_by = [order_by]
+    clauses = []
+    for field in order_by:
+        descending = field.startswith("-")
+        column = get_column(columns, field.lstrip("-"), model_name)
+        clauses.append(column.desc() if descending else column.asc())
+    return clauses
+
+
+def build_aggregates(
+    columns: dict[str, Any],
+    aggregates: AggregateSpec,
+    model_name: str,
+) -> list[Any]:
+    """
+    The function compiles an aggregate specification into labeled SQL
+    expressions.
+
+    Arguments:
+
+    * `aggregates`: A dictionary of `{label: function}` or
+    `{label: (function, field)}` pairs, e.g.
+    `{"total": "count", "mean_age": ("avg", "age")}`. A bare function name
+    is applied to every row (`count(*)`).
+    """
+    expressions = []
+    for label, aggregate in aggregates.items():
+        if isinstance(aggregate, str):
+            name, field = aggregate, None
+        elif (
+            isinstance(aggregate, list | tuple)
+            and len(aggregate) == 2
+            and all(isinstance(part, str) for part in aggregate)
+        ):
+            name, field = aggregate
+        else:
+            raise_bad_request(
+                f"Aggregate '{label}' expects a function name or a "
+                "(function, field) pair"
+            )
+        if name not in AGGREGATES:
+            raise_bad_request(f"Unsupported aggregate function '{name}'")
+        if field is not None:
+            expression = AGGREGATES[name](get_column(columns, field, model_name))
+        elif name == "count":
+            expression = AGGREGATES[name]()
+        else:
+            raise_bad_request(f"Aggregate '{name}' requires a field")
+        expressions.append(expression.label(label))
+    return expressions
@@ -0,0 +1,91 @@
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import defaultload, joinedload, raiseload, selectinload
+
+from sqlmodel_crud_manager.filters import raise_bad_request
+
+LoadSpec = str | list[str] | dict[str, str]
+
+STRATEGIES = {
+    "selectin": selectinload,
+    "joined": joinedload,
+    "raise": raiseload,
+}
+DEFAULT_STRATEGY = "selectin"
+
+
+def normalize_load(load: LoadSpec) -> tuple[tuple[str, str], ...]:
+    """
+    The function turns a load specification into a hashable tuple of
+    `(path, strategy)` pairs.
+    """
+    if isinstance(load, str):
+        load = [load]
+    if isinstance(load, dict):
+        return tuple(load.items())
+    return tuple((path, DEFAULT_STRATEGY) for path in load)
+
+
+@lru_cache(maxsize=256)
+def compile_load(model: Any, load: tuple[tuple[str, str], ...]) -> tuple[Any, ...]:
+    """
+    The function validates relationship paths against the model mapper and
+    builds the loader options for them. Results are cached, so every distinct
+    specification is only validated once per model.
+    """
+    options = []
+    paths = {path for path, _ in load}
+    for path, strategy in load:
+        if strategy not in STRATEGIES:
+            raise_bad_request(f"Unsupported loading strategy '{strategy}'")
+        if path == "*":
+            options.append(STRATEGIES[strategy]("*"))
+            continue
+
+        option, mapper = None, inspect(model)
+        segments = path.split(".")
+        for index, segment in enumerate(segments):
+            if segment not in mapper.relationships:
+                raise_bad_request(
+                    f"{mapper.class_.__name__} does not have a {segment} relationship"
+                )
+            attribute = getattr(mapper.class_, segment)
+            # The path leading to the last segment is loaded with the same
+            # strategy, unless it is requested separately or the strategy is
+            # `raise`, which only applies to the last segment
+            loader = STRATEGIES[strategy]
+            prefix = ".".join(segments[: index + 1])
+            if index < len(segments) - 1 and (strategy == "raise" or prefix in paths):
+                loader = defaultload
+            if option is None:
+                option = loader(attribute)
+            else:
+                option = getattr(option, loader.__name__)(attribute)
+            mapper = mapper.relationships[segment].mapper
+        options.append(option)
+    return tuple(options)
+
+
+def build_load_options(model: Any, load: LoadSpec) -> tuple[Any, ...]:
+    """
+    The function returns the loader options for a load specification.
+
+    Arguments:
+
+    * `model`: The model the relationship paths start from.
+    * `load`: A relationship path, a list of paths loaded with `selectinload`,
+    or a dictionary of paths to one of the `selectin`, `joined` or `raise`
+    strategies. Nested relationships are separated by dots, e.g.
+    `{"items": "selectin", "items.product": "joined", "*": "raise"}`. The
+    relationships leading to a nested one are loaded with its strategy too,
+    unless they are listed with their own.
+
+    Returns:
+
+    A tuple of options that can be passed to `Select.options`.
+    """
+    if not load:
+        return ()
+    return compile_load(model, normalize_load(load))
@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Field, SQLModel, create_engine
+
+from sqlmodel_crud_manager.buffer import BufferedWriter
+from sqlmodel_crud_manager.crud import CRUDManager
+
+
+class Reading(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    sensor: str
+    value: float
+    unit: str = "C"
+
+
+engine = create_engine(
+    "sqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+SQLModel.metadata.create_all(engine)
+crud = CRUDManager(Reading, engine)
+
+commits = []
+event.listen(engine, "commit", lambda conn: commits.append(conn))
+
+
+def test_writes_are_coalesced_and_flushed_in_one_transaction():
+    with BufferedWriter(crud, flush_interval=None) as writer:
+        writer.create(Reading(id=1, sensor="a", value=1.0))
+        writer.create(Reading(id=2, sensor="b", value=2.0))
+        writer.flush()
+
+        commits.clear()
+        for value in range(10):
+            writer.update(Reading(id=1, sensor="a", value=value))
+        writer.update(Reading(id=2, sensor="b", value=5.0, unit="F"))
+        writer.upsert(Reading(id=3, sensor="c", value=3.0))
+        writer.upsert(Reading(id=2, sensor="b", value=6.0))
+        assert writer.pending == 3
+        assert crud.get(1).value == 1.0
+    assert len(commits) == 1
+
+    readings = {reading.id: reading for reading in crud.list()}
+    assert readings[1].value == 9.0
+    assert (readings[2].value, readings[2].unit) == (6.0, "F")
+    assert readings[3].sensor == "c"
+
+
+def test_size_threshold_and_backpressure():
+    writer = BufferedWriter(crud, flush_interval=None, max_batch_size=3)
+    for value in range(7):
+        writer.create(Reading(sensor="batched", value=value))
+    assert writer.pending == 1
+    writer.close()
+    assert len(crud.get_by_field("sensor", "batched", allows_multiple=True)) == 7
+    with pytest.raises(RuntimeError):
+        writer.create(Reading(sensor="batched", value=0))
+
+
+def test_background_thread_flushes():
+    with BufferedWriter(crud, flush_interval=0.01) as writer:
+        writer.create(Reading(sensor="background", value=1.0))
+        for _ in range(100):
+            if writer.pending == 0:
+                break
+            writer._thread.join(0.01)
+        assert writer.pending == 0
+    assert crud.get_by_field("sensor", "background") is not None
+
+
+def test_failed_writes_are_reported():
+    failures = []
+    writer = BufferedWriter(
+        crud,
+        flush_interval=None,
+        on_error=lambda write, exc: failures.append(write),
+    )
+    writer.create(Reading(id=100, sensor="ok", value=1.0))
+    writer.create(Reading(id=1, sensor="duplicate", value=1.0))
+    writer.close()
+    assert [write.values["sensor"] for write in failures] == ["duplicate"]
+    assert crud.get(100).sensor == "ok"
+
+
+def test_on_error_can_requeue_writes():
+    def requeue(write, exc):
+        writer.create(Reading(sensor="requeued", value=write.values["value"]))
+
+    writer = BufferedWriter(
+        crud, flush_interval=None, max_batch_size=1, on_error=requeue
+    )
+    worker = threading.Thread(
+        target=writer.create,
+        args=(Reading(id=1, sensor="duplicate", value=7.0),),
+        daemon=True,
+    )
+    worker.start()
+    worker.join(5)
+    assert not worker.is_alive()
+    writer.close()
+    assert crud.get_by_field("sensor", "requeued").value == 7.0
+
+
+def test_versioned_managers_are_rejected():
+    with pytest.raises(ValueError, match="optimistic concurrency"):
+        BufferedWriter(CRUDManager(Reading, engine, version_field="value"))
+
+
+def test_custom_primary_keys_are_rejected():
+    with pytest.raises(ValueError, match="mapped primary key"):
+        BufferedWriter(CRUDManager(Reading, engine, primary_key="sensor"))
@@ -0,0 +1,149 @@
+import json
+import multiprocessing
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Field, Session, SQLModel, create_engine, select
+
+from sqlmodel_crud_manager.buffer import BufferedWriter
+from sqlmodel_crud_manager.crud import CRUDManager
+from sqlmodel_crud_manager.events import (
+    CallbackSink,
+    OutboxRecord,
+    OutboxSink,
+    QueueSink,
+)
+
+
+class Gizmo(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    name: str
+    price: int = 0
+    version: int = 1
+
+
+class GizmoOutbox(OutboxRecord, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+
+
+engine = create_engine("sqlite://")
+SQLModel.metadata.create_all(engine)
+
+events = []
+crud = CRUDManager(
+    Gizmo,
+    engine,
+    version_field="version",
+    event_sinks=[CallbackSink(events.append), OutboxSink(GizmoOutbox)],
+)
+
+
+def summary():
+    return [
+        (event.operation, event.primary_keys, event.changed_columns) for event in events
+    ]
+
+
+def test_mutations_emit_events():
+    events.clear()
+    gizmo = crud.create(Gizmo(name="Batarang"))
+    gizmo.price = 10
+    crud.update(gizmo)
+    crud.create_or_update(Gizmo(name="Batarang", price=10), "name", only_changed=True)
+    crud.create_or_update(Gizmo(name="Batarang", price=12), "name", only_changed=True)
+    others = crud.create_multiple([Gizmo(name="Grapple"), Gizmo(name="Cowl")])
+    crud.delete(others[1].id)
+
+    assert summary() == [
+        ("create", (gizmo.id,), ("name", "price", "version")),
+        ("update", (gizmo.id,), ("name", "price", "version")),
+        ("update", (gizmo.id,), ("price", "version")),
+        ("create", (others[0].id, others[1].id), ("name", "price", "version")),
+        ("delete", (others[1].id,), None),
+    ]
+    assert events[0].model == "Gizmo"
+
+
+def test_outbox_is_written_in_the_same_transaction():
+    with Session(engine) as session:
+        last_id = len(session.exec(select(GizmoOutbox)).all())
+    events.clear()
+    gizmo = crud.create(Gizmo(name="Utility belt"))
+    stale = crud.get(gizmo.id).model_copy()
+    crud.update(crud.get(gizmo.id))
+    with pytest.raises(HTTPException):
+        crud.update(stale)
+    assert [event.operation for event in events] == ["create", "update"]
+
+    with Session(engine) as session:
+        rows = session.exec(select(GizmoOutbox).where(GizmoOutbox.id > last_id)).all()
+    assert [row.operation for row in rows] == ["create", "update"]
+    assert json.loads(rows[1].changed_columns) == ["name", "price", "version"]
+
+
+def test_queue_sink():
+    queue = multiprocessing.Queue()
+    manager = CRUDManager(Gizmo, engine, event_sinks=[QueueSink(queue)])
+    gizmo = manager.create(Gizmo(name="Smoke pellet"))
+    event = queue.get(timeout=5)
+    assert (event.operation, event.primary_keys) == ("create", (gizmo.id,))
+
+
+def test_buffered_writes_emit_events():
+    received = []
+    manager = CRUDManager(Gizmo, engine, event_sinks=[CallbackSink(received.append)])
+    with BufferedWriter(manager, flush_interval=None) as writer:
+        writer.create(Gizmo(id=500, name="Buffered"))
+        writer.flush()
+        writer.update(Gizmo(id=500, price=3))
+    assert [(e.operation, e.primary_keys) for e in received] == [
+        ("create", (500,)),
+        ("update", (500,)),
+    ]
+    assert received[1].changed_columns == ("price",)
+
+
+def test_failing_callbacks_do_not_fail_the_write():
+    def explode(event):
+        raise RuntimeError("boom")
+
+    manager = CRUDManager(Gizmo, engine, event_sinks=[CallbackSink(explode)])
+    gizmo = manager.create(Gizmo(name="Decoy"))
+    assert crud.get(gizmo.id) is not None
+
+
+def test_updates_of_missing_rows_do_not_emit_events():
+    received = []
+    manager = CRUDManager(Gizmo, engine, event_sinks=[CallbackSink(received.append)])
+    gizmo = manager.create(Gizmo(name="Grapnel"))
+    received.clear()
+
+    manager.update(Gizmo(id=9_999, name="Ghost"))
+    gizmo.price = 4
+    manager.update_multiple([gizmo, Gizmo(id=9_998, name="Ghost")])
+    assert [(e.operation, e.primary_keys) for e in received] == [
+        ("update", (gizmo.id,))
+    ]
+
+    errors = []
+    with BufferedWriter(
+        manager, flush_interval=None, on_error=lambda w, e: errors.append(w)
+    ) as writer:
+        writer.update(Gizmo(id=9_997, name="Ghost"))
+    assert [write.pk for write in errors] == [(9_997,)]
+    assert len(received) == 1
+
+
+def test_update_multiple_reports_the_columns_of_every_row():
+    received = []
+    manager = CRUDManager(Gizmo, engine, event_sinks=[CallbackSink(received.append)])
+    first, second = manager.create_multiple([Gizmo(name="Rope"), Gizmo(name="Hook")])
+    received.clear()
+
+    manager.update_multiple(
+        [Gizmo(id=first.id, name="Long rope"), Gizmo(id=second.id, price=8)]
+    )
+    assert [(e.primary_keys, e.changed_columns) for e in received] == [
+        ((first.id,), ("name",)),
+        ((second.id,), ("price",)),
+    ]
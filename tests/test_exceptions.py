@@ -0,0 +1,66 @@
+import subprocess
+import sys
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Field, SQLModel, create_engine
+
+from sqlmodel_crud_manager.crud import CRUDManager
+from sqlmodel_crud_manager.exceptions import (
+    CRUDException,
+    to_crud_exception,
+    to_http_exception,
+)
+
+
+class Gadget(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    name: str
+
+
+engine = create_engine("sqlite://")
+SQLModel.metadata.create_all(engine)
+
+
+def test_import_does_not_require_fastapi():
+    code = (
+        "import sys; import sqlmodel_crud_manager.crud; "
+        "assert 'fastapi' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_default_translator():
+    crud = CRUDManager(Gadget, engine)
+    with pytest.raises(HTTPException) as exc:
+        crud.get_or_404(1)
+    assert exc.value.status_code == 404
+    assert exc.value.detail == "Gadget with id 1 not found"
+    assert isinstance(exc.value.__cause__, CRUDException)
+
+
+def test_custom_translator():
+    crud = CRUDManager(Gadget, engine, exception_translator=to_crud_exception)
+    with pytest.raises(CRUDException) as exc:
+        crud.get_or_404(1)
+    assert exc.value.status_code == 404
+    with pytest.raises(CRUDException) as exc:
+        crud.create({"id": "not an id"})
+    assert exc.value.status_code == 500
+
+    crud = CRUDManager(Gadget, engine, exception_translator=lambda e: e)
+    with pytest.raises(CRUDException):
+        crud.get_by_field("NotExistent", 1)
+
+
+def test_translators_are_idempotent():
+    error = to_http_exception(CRUDException(409, "conflict"))
+    assert (error.status_code, error.detail) == (409, "conflict")
+    assert to_http_exception(error) is error
+    error = to_crud_exception(ValueError("boom"))
+    assert to_crud_exception(error) is error
+
+
+def test_methods_keep_their_metadata():
+    assert CRUDManager.get.__name__ == "get"
+    assert "primary key" in CRUDManager.get.__doc__
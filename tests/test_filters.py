@@ -0,0 +1,117 @@
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Field, SQLModel, create_engine
+
+from sqlmodel_crud_manager.crud import CRUDManager
+
+
+class Villain(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    name: str
+    power: int
+    city: str | None = None
+
+
+engine = create_engine("sqlite://")
+SQLModel.metadata.create_all(engine)
+crud = CRUDManager(Villain, engine)
+crud.create_multiple(
+    [
+        Villain(name="Joker", power=40, city="Gotham"),
+        Villain(name="Bane", power=80, city="Gotham"),
+        Villain(name="Lex", power=60, city="Metropolis"),
+        Villain(name="Zod", power=95, city="Metropolis"),
+        Villain(name="Drifter", power=10),
+    ]
+)
+
+
+def names(villains):
+    return [villain.name for villain in villains]
+
+
+def test_filter_operators():
+    assert names(crud.filter({"power": {"gt": 50}}, order_by="power")) == [
+        "Lex",
+        "Bane",
+        "Zod",
+    ]
+    assert names(crud.filter({"power": {"between": (40, 60)}}, order_by="name")) == [
+        "Joker",
+        "Lex",
+    ]
+    assert names(crud.filter({"name": {"in": ["Zod", "Bane"]}}, order_by="name")) == [
+        "Bane",
+        "Zod",
+    ]
+    assert names(crud.filter({"name": {"like": "J%"}})) == ["Joker"]
+    assert names(crud.filter({"city": {"is_null": True}})) == ["Drifter"]
+    assert names(crud.filter({"city": "Gotham", "power": {"lt": 50}})) == ["Joker"]
+
+
+def test_filter_or_group_order_and_limit():
+    villains = crud.filter(
+        {"or": [{"city": "Metropolis"}, {"power": {"le": 10}}]},
+        order_by="-power",
+        limit=2,
+    )
+    assert names(villains) == ["Zod", "Lex"]
+    assert names(crud.filter(order_by="power", limit=1, offset=1)) == ["Joker"]
+
+
+def test_filter_invalid_field_or_operator():
+    with pytest.raises(HTTPException) as exc:
+        crud.filter({"NotExistent": 1})
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException) as exc:
+        crud.filter({"power": {"NotExistent": 1}})
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException):
+        crud.filter(order_by="-NotExistent")
+
+
+def test_aggregate():
+    assert crud.aggregate({"total": "count"}) == [{"total": 5}]
+    rows = crud.aggregate(
+        {"total": "count", "max_power": ("max", "power")},
+        filters={"city": {"is_null": False}},
+        group_by=["city"],
+        order_by="-max_power",
+    )
+    assert rows == [
+        {"city": "Metropolis", "total": 2, "max_power": 95},
+        {"city": "Gotham", "total": 2, "max_power": 80},
+    ]
+    with pytest.raises(HTTPException):
+        crud.aggregate({"total": "median"})
+    with pytest.raises(HTTPException):
+        crud.aggregate({"total": "sum"})
+
+
+@pytest.mark.filterwarnings("error")
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {"power": {"between": 5}},
+        {"power": {"between": (1,)}},
+        {"name": {"in": "ab"}},
+        {"name": {"not_in": 1}},
+        {"or": []},
+        {"and": [{}]},
+        {"or": ["Joker"]},
+        {"power": {}},
+    ],
+)
+def test_filter_malformed_specs(spec):
+    with pytest.raises(HTTPException) as exc:
+        crud.filter(spec)
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "aggregate", [("sum",), ("sum", "power", "city"), ["max", 1], 3, None]
+)
+def test_aggregate_malformed_specs(aggregate):
+    with pytest.raises(HTTPException) as exc:
+        crud.aggregate({"t": aggregate})
+    assert exc.value.status_code == 400
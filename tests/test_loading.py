@@ -0,0 +1,123 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlmodel import Field, Relationship, SQLModel, create_engine
+
+from sqlmodel_crud_manager.crud import CRUDManager
+
+
+class Product(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    name: str
+
+
+class LineItem(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    order_id: int = Field(foreign_key="order.id")
+    product_id: int = Field(foreign_key="product.id")
+    order: "Order" = Relationship(back_populates="items")
+    product: Product = Relationship()
+
+
+class Order(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    customer: str
+    items: list[LineItem] = Relationship(back_populates="order")
+
+
+engine = create_engine("sqlite://")
+SQLModel.metadata.create_all(engine)
+
+selects = []
+event.listen(
+    engine,
+    "before_cursor_execute",
+    lambda conn, cursor, statement, *args: (
+        selects.append(statement) if statement.startswith("SELECT") else None
+    ),
+)
+
+product_crud = CRUDManager(Product, engine)
+order_crud = CRUDManager(Order, engine)
+item_crud = CRUDManager(LineItem, engine)
+products = product_crud.create_multiple([Product(name="Cape"), Product(name="Mask")])
+orders = order_crud.create_multiple(
+    [Order(customer=f"Customer {index}") for index in range(5)]
+)
+item_crud.create_multiple(
+    [
+        {"order_id": order.id, "product_id": product.id}
+        for order in orders
+        for product in products
+    ]
+)
+order_ids = [order.id for order in orders]
+
+
+def fresh(**kwargs):
+    return CRUDManager(Order, engine, **kwargs)
+
+
+def test_list_loads_relationships_in_constant_queries():
+    crud = fresh()
+    selects.clear()
+    result = crud.list(load=["items", "items.product"])
+    assert {item.product.name for order in result for item in order.items} == {
+        "Cape",
+        "Mask",
+    }
+    assert len(selects) == 3
+
+
+@pytest.mark.parametrize("load", ["items.product", ["items.product"]])
+def test_nested_path_loads_the_whole_path(load):
+    crud = fresh()
+    selects.clear()
+    result = crud.list(load=load)
+    assert {item.product.name for order in result for item in order.items} == {
+        "Cape",
+        "Mask",
+    }
+    assert len(selects) == 3
+
+
+def test_manager_default_and_strategies():
+    crud = fresh(load={"items": "joined"})
+    selects.clear()
+    order = crud.get(order_ids[0])
+    assert len(order.items) == 2
+    orders_ = crud.filter({"customer": {"like": "Customer%"}}, limit=2)
+    assert [len(order.items) for order in orders_] == [2, 2]
+    assert len(selects) == 2
+
+    crud = fresh()
+    order = crud.get_by_field("id", order_ids[1], load={"items": "raise"})
+    with pytest.raises(InvalidRequestError):
+        order.items  # noqa: B018
+
+
+def test_invalid_relationship_paths():
+    with pytest.raises(HTTPException) as exc:
+        fresh().get_by_ids([1], load="NotExistent")
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException):
+        fresh().list(load="items.NotExistent")
+    with pytest.raises(HTTPException):
+        fresh().list(load={"items": "NotExistent"})
+
+
+def test_mixed_strategies_on_nested_paths():
+    crud = fresh()
+    selects.clear()
+    result = crud.list(load={"items": "selectin", "items.product": "joined"})
+    assert {item.product.name for order in result for item in order.items} == {
+        "Cape",
+        "Mask",
+    }
+    assert len(selects) == 2
+
+    order = crud.get(
+        order_ids[0], load={"items": "selectin", "items.product": "joined"}
+    )
+    assert len(order.items) == 2
@@ -0,0 +1,86 @@
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Field, SQLModel, create_engine
+
+from sqlmodel_crud_manager.crud import CRUDManager
+
+
+class Team(SQLModel, table=True):
+    code: str = Field(primary_key=True)
+    name: str
+
+
+class Membership(SQLModel, table=True):
+    team_code: str = Field(primary_key=True)
+    member_id: int = Field(primary_key=True)
+    role: str
+
+
+engine = create_engine("sqlite://")
+SQLModel.metadata.create_all(engine)
+teams = CRUDManager(Team, engine)
+memberships = CRUDManager(Membership, engine)
+
+
+def test_primary_key_is_detected():
+    assert teams.primary_key == ("code",)
+    assert memberships.primary_key == ("team_code", "member_id")
+
+
+def test_named_primary_key():
+    teams.create_multiple([Team(code="JLA", name="Justice League")])
+    teams.create(Team(code="TT", name="Titans"))
+    assert teams.get("JLA").name == "Justice League"
+    assert [team.code for team in teams.get_by_ids(["TT", "JLA", "X"])] == [
+        "JLA",
+        "TT",
+    ]
+
+    team = teams.create_or_update(
+        Team(code="TT", name="Teen Titans"), search_field="code"
+    )
+    assert team.code == "TT"
+    assert teams.get("TT").name == "Teen Titans"
+
+    teams.create_or_update(Team(code="TT", name="New Teen Titans"))
+    assert teams.get("TT").name == "New Teen Titans"
+    assert teams.get_or_create(Team(code="JLA", name="Other")).name == (
+        "Justice League"
+    )
+    assert teams.get_or_create(Team(code="JSA", name="Justice Society")).code == "JSA"
+
+    with pytest.raises(HTTPException) as exc:
+        teams.get_or_404("X")
+    assert exc.value.detail == "Team with code X not found"
+
+
+def test_composite_primary_key():
+    memberships.create_multiple(
+        [
+            Membership(team_code="JLA", member_id=1, role="leader"),
+            Membership(team_code="JLA", member_id=2, role="member"),
+            Membership(team_code="TT", member_id=1, role="mentor"),
+        ]
+    )
+    assert memberships.get(("TT", 1)).role == "mentor"
+    assert memberships.get({"team_code": "JLA", "member_id": 2}).role == "member"
+    found = memberships.get_by_ids([("JLA", 1), ("TT", 1), ("TT", 2)])
+    assert sorted(obj.role for obj in found) == ["leader", "mentor"]
+
+    membership = memberships.get(("JLA", 2))
+    membership.role = "founder"
+    memberships.update(membership)
+    assert memberships.get(("JLA", 2)).role == "founder"
+
+    deleted = memberships.delete_multiple([("JLA", 1), ("TT", 1)])
+    assert len(deleted) == 2
+    assert [obj.member_id for obj in memberships.list()] == [2]
+
+    with pytest.raises(HTTPException) as exc:
+        memberships.get("JLA")
+    assert exc.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc:
+        memberships.create_or_update(Membership(team_code="TT", member_id=3, role="x"))
+    assert exc.value.status_code == 400
+    assert "create_or_update_by_fields" in exc.value.detail
@@ -0,0 +1,68 @@
+from sqlalchemy import event
+from sqlmodel import Field, SQLModel, create_engine
+
+from sqlmodel_crud_manager.crud import CRUDManager
+
+
+class Sidekick(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    name: str
+    mentor: str
+    age: int | None = None
+
+
+engine = create_engine("sqlite://")
+SQLModel.metadata.create_all(engine)
+crud = CRUDManager(Sidekick, engine)
+
+updates = []
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def record_updates(conn, cursor, statement, parameters, context, executemany):
+    if statement.startswith("UPDATE"):
+        updates.append(statement)
+
+
+def test_create_or_update_only_changed():
+    robin = crud.create(Sidekick(name="Robin", mentor="Batman", age=15))
+
+    updates.clear()
+    same = Sidekick(name="Robin", mentor="Batman", age=15)
+    hero = crud.create_or_update(same, search_field="name", only_changed=True)
+    assert hero.id == robin.id
+    assert updates == []
+
+    older = Sidekick(name="Robin", mentor="Batman", age=16)
+    hero = crud.create_or_update_by_fields(older, ["name"], only_changed=True)
+    assert hero.id == robin.id
+    assert hero.age == 16
+    assert len(updates) == 1
+    assert "age=" in updates[0]
+    assert "mentor" not in updates[0]
+
+
+def test_sync_by_fields():
+    crud.create(Sidekick(name="Bucky", mentor="Cap", age=20))
+
+    updates.clear()
+    result = crud.sync_by_fields(
+        [
+            Sidekick(name="Bucky", mentor="Cap", age=20),
+            Sidekick(name="Robin", mentor="Nightwing", age=16),
+            Sidekick(name="Kid Flash", mentor="Flash"),
+        ],
+        ["name"],
+    )
+    assert [obj.name for obj in result.unchanged] == ["Bucky"]
+    assert [obj.name for obj in result.updated] == ["Robin"]
+    assert [obj.name for obj in result.created] == ["Kid Flash"]
+    assert result.created[0].id is not None
+    assert result.updated[0].mentor == "Nightwing"
+    assert len(updates) == 1
+
+    objects = crud.create_or_update_multiple_by_fields(
+        [Sidekick(name="Kid Flash", mentor="Flash")], ["name"], only_changed=True
+    )
+    assert [obj.name for obj in objects] == ["Kid Flash"]
+    assert len(updates) == 1
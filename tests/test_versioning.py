@@ -0,0 +1,108 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Field, Session, SQLModel, create_engine
+
+from sqlmodel_crud_manager.crud import CRUDManager
+
+
+class Account(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    owner: str
+    balance: int = 0
+    version: int = 1
+
+
+class Document(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    title: str
+    updated_at: datetime | None = None
+
+
+engine = create_engine("sqlite://")
+SQLModel.metadata.create_all(engine)
+crud = CRUDManager(Account, engine, version_field="version")
+document_crud = CRUDManager(Document, engine, version_field="updated_at")
+
+
+def read(pk):
+    with Session(engine) as session:
+        return session.get(Account, pk)
+
+
+def test_update_bumps_version():
+    account = crud.create(Account(owner="Bruce", balance=100))
+    stale = read(account.id)
+
+    fresh = read(account.id)
+    fresh.balance = 150
+    crud.update(fresh)
+    assert fresh.version == 2
+    assert read(account.id).balance == 150
+
+    fresh.balance = 175
+    crud.update(fresh)
+    assert read(account.id).version == 3
+
+    stale.balance = 0
+    with pytest.raises(HTTPException) as exc:
+        crud.update(stale)
+    assert exc.value.status_code == 409
+    assert read(account.id).balance == 175
+
+
+def test_update_multiple_reports_conflicts():
+    first = crud.create(Account(owner="Clark"))
+    second = crud.create(Account(owner="Diana"))
+    stale = read(second.id)
+    crud.update(read(second.id))
+
+    objects = [read(first.id), stale]
+    for obj in objects:
+        obj.balance = 10
+    with pytest.raises(HTTPException) as exc:
+        crud.update_multiple(objects)
+    assert exc.value.status_code == 409
+    assert exc.value.detail["conflicts"] == [second.id]
+    assert read(first.id).balance == 0
+
+    updated = crud.update_multiple([read(first.id), read(second.id)])
+    assert [obj.version for obj in updated] == [2, 3]
+
+
+def test_create_or_update_uses_current_version():
+    crud.create(Account(owner="Barry"))
+    account = crud.create_or_update(
+        Account(owner="Barry", balance=5), search_field="owner"
+    )
+    assert read(account.id).version == 2
+    account = crud.create_or_update(
+        Account(owner="Barry", balance=7), search_field="owner", only_changed=True
+    )
+    assert read(account.id).version == 3
+    assert read(account.id).balance == 7
+
+
+def test_timestamp_version_field():
+    document = document_crud.create(Document(title="Draft"))
+    with Session(engine) as session:
+        stale = session.get(Document, document.id)
+
+    with Session(engine) as session:
+        fresh = session.get(Document, document.id)
+    fresh.title = "Final"
+    document_crud.update(fresh)
+    assert isinstance(fresh.updated_at, datetime)
+    first_version = fresh.updated_at
+
+    fresh.title = "Published"
+    document_crud.update(fresh)
+    assert fresh.updated_at > first_version
+
+    stale.title = "Lost"
+    with pytest.raises(HTTPException) as exc:
+        document_crud.update(stale)
+    assert exc.value.status_code == 409
+    with Session(engine) as session:
+        assert session.get(Document, document.id).title == "Published"